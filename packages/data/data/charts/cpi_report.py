@@ -15,9 +15,11 @@ from typing import Dict, List, Optional, Tuple
 import os
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from database.connection import get_engine
+
 
 DEFAULT_DB_URL = "sqlite:///./fomc_data.db"
 
@@ -97,10 +99,7 @@ class CpiReportBuilder:
             "核心商品": "核心商品（不含食品和能源类）",
             "核心服务": "核心服务（不含能源）",
         }
-        connect_args: Dict[str, bool] = {}
-        if database_url.startswith("sqlite:///"):
-            connect_args["check_same_thread"] = False
-        self.engine: Engine = create_engine(database_url, connect_args=connect_args, echo=False)
+        self.engine: Engine = get_engine(database_url)
 
     def prepare_payload(self, as_of: Optional[datetime] = None) -> CpiReportPayload:
         headline = self._load_indicator_series("CPIAUCSL")
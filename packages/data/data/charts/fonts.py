@@ -0,0 +1,50 @@
+"""
+Shared matplotlib font setup for the chart builders.
+
+All charts carry Chinese titles and labels, so each builder points matplotlib at the
+first installed CJK font before plotting.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+import matplotlib.pyplot as plt
+from matplotlib import font_manager as fm
+
+
+PREFERRED_CJK_FONTS = [
+    "SimHei",
+    "Microsoft YaHei",
+    "Noto Sans CJK SC",
+    "WenQuanYi Micro Hei",
+    "Source Han Sans SC",
+]
+
+
+@lru_cache(maxsize=1)
+def pick_cjk_font() -> Optional[str]:
+    """
+    Return the first installed CJK font; the font list is scanned once per process.
+    """
+
+    available_fonts = {font.name for font in fm.fontManager.ttflist}
+    for font_name in PREFERRED_CJK_FONTS:
+        if font_name in available_fonts:
+            return font_name
+    return None
+
+
+def configure_cjk_fonts() -> None:
+    """
+    Ensure matplotlib can render Chinese characters by picking the first available CJK font.
+    """
+
+    font_name = pick_cjk_font()
+    sans_serif = plt.rcParams.get("font.sans-serif", [])
+    if font_name and (not sans_serif or sans_serif[0] != font_name):
+        plt.rcParams["font.sans-serif"] = [font_name] + sans_serif
+
+    # Disable unicode minus either way to avoid boxes
+    plt.rcParams["axes.unicode_minus"] = False
@@ -3,6 +3,8 @@ Compute industry-level contributions to total nonfarm payroll gains.
 
 The output is a JSON-friendly payload used by the web front-end to draw
 horizontal stacked bars (one row per month, stacked by industry share).
+
+Run from packages/data as ``python -m data.charts.industry_job_contributions``.
 """
 
 from __future__ import annotations
@@ -12,9 +14,11 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from database.connection import get_engine
+
 DEFAULT_DB_URL = "sqlite:///./fomc_data.db"
 
 # Ordered list comes from README "分行业新增就业"列表
@@ -50,10 +54,7 @@ class IndustryContributionChartBuilder:
 
     def __init__(self, database_url: str = DEFAULT_DB_URL):
         self.database_url = database_url
-        connect_args: Dict[str, bool] = {}
-        if database_url.startswith("sqlite:///"):
-            connect_args["check_same_thread"] = False
-        self.engine: Engine = create_engine(database_url, connect_args=connect_args, echo=False)
+        self.engine: Engine = get_engine(database_url)
 
     def prepare_payload(
         self, year: Optional[int] = None, as_of: Optional[datetime] = None
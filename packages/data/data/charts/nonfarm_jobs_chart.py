@@ -1,8 +1,8 @@
 """
 Chart generator for "新增非农就业（万人）及失业率(%，右)".
 
-The module keeps the chart pipeline decoupled from the rest of the system:
-1. Read indicator series (PAYEMS & UNRATE) directly from the project database.
+The module keeps the chart pipeline in one place:
+1. Read indicator series (PAYEMS & UNRATE) from the project database via database.connection.
 2. Transform PAYEMS into monthly changes expressed in ten-thousand jobs.
 3. Plot a combo chart (bars + secondary-axis line) limited to the latest 3 years.
 
@@ -12,80 +12,123 @@ from data.charts.nonfarm_jobs_chart import LaborMarketChartBuilder
 
 builder = LaborMarketChartBuilder()
 figure, payload = builder.build(save_path="charts/nonfarm_vs_unemployment.png")
+
+Run from packages/data as ``python -m data.charts.nonfarm_jobs_chart``.
 """
 
 from __future__ import annotations
 
+import glob
+import hashlib
+import os
+import tempfile
+import zipfile
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
 
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
-from matplotlib import font_manager as fm
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import DateTime, bindparam, text
 from sqlalchemy.engine import Engine
 
+from database.connection import get_engine
+
+from .fonts import configure_cjk_fonts
+
 
 DEFAULT_DB_URL = "sqlite:///./fomc_data.db"
 
+# Rows fetched per round when streaming a series out of SQLite.
+SERIES_CHUNK_SIZE = 10_000
+
+# Series whose stored rows feed the payload (and therefore key its cache entry).
+CHART_SERIES = ("PAYEMS", "UNRATE")
+
+
+def diff_scaled(values: np.ndarray, scale: float) -> np.ndarray:
+    """
+    Return (values[i] - values[i-1]) / scale, with NaN for the first element.
+
+    Both steps write into a single output array, so no intermediate arrays are allocated.
+    """
+
+    out = np.full_like(values, np.nan)
+    np.subtract(values[1:], values[:-1], out=out[1:])
+    np.divide(out[1:], scale, out=out[1:])
+    return out
+
 
 @dataclass
 class ChartPayload:
     """
     Structured bundle describing the transformed datasets that feed the chart.
+
+    Series are kept as parallel date/value arrays; the DataFrame properties build
+    the tabular view once, on first access, for callers that select rows by month.
     """
 
-    payems_changes: pd.DataFrame
-    unemployment_rate: pd.DataFrame
+    payems_dates: np.ndarray
+    payems_change_10k: np.ndarray
+    unrate_dates: np.ndarray
+    unrate_value: np.ndarray
     start_date: datetime
     end_date: datetime
 
+    @cached_property
+    def payems_changes(self) -> pd.DataFrame:
+        return pd.DataFrame({"date": self.payems_dates, "monthly_change_10k": self.payems_change_10k})
+
+    @cached_property
+    def unemployment_rate(self) -> pd.DataFrame:
+        return pd.DataFrame({"date": self.unrate_dates, "value": self.unrate_value})
+
 
 class LaborMarketChartBuilder:
     """
     Builder that loads, transforms, and plots the labor-market combo chart.
     """
 
-    def __init__(self, database_url: str = DEFAULT_DB_URL, lookback_years: int = 3):
+    _shared_figure: Optional[Tuple[Figure, Axes, Axes]] = None
+
+    def __init__(
+        self,
+        database_url: str = DEFAULT_DB_URL,
+        lookback_years: int = 3,
+        cache_dir: Optional[str] = None,
+    ):
         self.database_url = database_url
         self.lookback_years = lookback_years
-        self._configure_fonts()
-        connect_args: Dict[str, bool] = {}
-        if database_url.startswith("sqlite:///"):
-            # SQLite needs this flag when the engine is shared across threads.
-            connect_args["check_same_thread"] = False
-        self.engine: Engine = create_engine(database_url, connect_args=connect_args, echo=False)
-
-    def _configure_fonts(self) -> None:
-        """
-        Ensure matplotlib can render Chinese characters by picking the first available CJK font.
-        """
-
-        preferred_fonts = [
-            "SimHei",
-            "Microsoft YaHei",
-            "Noto Sans CJK SC",
-            "WenQuanYi Micro Hei",
-            "Source Han Sans SC",
-        ]
-        available_fonts = {font.name for font in fm.fontManager.ttflist}
-        for font_name in preferred_fonts:
-            if font_name in available_fonts:
-                plt.rcParams["font.sans-serif"] = [font_name] + plt.rcParams.get("font.sans-serif", [])
-                plt.rcParams["axes.unicode_minus"] = False
-                return
-
-        # Fallback: still disable unicode minus to avoid boxes
-        plt.rcParams["axes.unicode_minus"] = False
+        # When set, prepared payloads are persisted here and reused until new data lands.
+        self.cache_dir = cache_dir
+        configure_cjk_fonts()
+        self.engine: Engine = get_engine(database_url)
 
     def build(
-        self, save_path: Optional[str] = None, as_of: Optional[datetime] = None
+        self,
+        save_path: Optional[str] = None,
+        as_of: Optional[datetime] = None,
+        reuse_figure: bool = False,
     ) -> Tuple[plt.Figure, ChartPayload]:
-        """Public entry point: prepare data, then plot."""
+        """
+        Public entry point: prepare data, then plot.
+
+        With reuse_figure=True the chart is drawn into one figure shared by all builders,
+        which keeps memory flat when rendering many charts in a batch. The returned figure
+        is overwritten by the next such call, so save or copy it before building again.
+        """
 
         payload = self.prepare_payload(as_of=as_of)
-        fig = self._plot(payload)
+        if reuse_figure:
+            fig, ax_left, ax_right = self._shared_canvas()
+            self.render_into(fig, ax_left, ax_right, payload)
+        else:
+            fig = self._plot(payload)
 
         if save_path:
             fig.savefig(save_path, dpi=300, bbox_inches="tight")
@@ -102,50 +145,172 @@ class LaborMarketChartBuilder:
         Load the PAYEMS & UNRATE series, transform them, and constrain to the desired window.
         """
 
-        payems = self._load_indicator_series("PAYEMS")
-        payems["monthly_change"] = payems["value"].diff()
-        payems["monthly_change_10k"] = payems["monthly_change"] / 10.0
-        payems = payems.dropna(subset=["monthly_change_10k"])
-
-        start_date, end_date = self._infer_window(payems, as_of=as_of)
-        payems_window = payems[(payems["date"] >= start_date) & (payems["date"] <= end_date)].copy()
-
-        unemployment = self._load_indicator_series("UNRATE")
-        unemployment_window = unemployment[
-            (unemployment["date"] >= start_date) & (unemployment["date"] <= end_date)
-        ].copy()
-
-        return ChartPayload(
-            payems_changes=payems_window,
-            unemployment_rate=unemployment_window,
+        latest_date = self._latest_date("PAYEMS")
+        start_date, end_date = self._infer_window(latest_date, as_of=as_of)
+
+        cache_path = self._cache_path(end_date)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cached:
+                    return ChartPayload(
+                        payems_dates=cached["payems_dates"],
+                        payems_change_10k=cached["payems_change_10k"],
+                        unrate_dates=cached["unrate_dates"],
+                        unrate_value=cached["unrate_value"],
+                        start_date=start_date,
+                        end_date=end_date,
+                    )
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                # Unreadable entry (e.g. truncated on disk): recompute and overwrite it below.
+                pass
+
+        # Reach one month further back so the first in-window observation has a predecessor.
+        payems = self._load_indicator_series(
+            "PAYEMS", start_date - pd.DateOffset(months=1), end_date
+        )
+        payems_dates = payems["date"].to_numpy()
+        payems_change = diff_scaled(payems["value"].to_numpy(dtype=float), 10.0)
+        # Dates are sorted, so the window is a contiguous slice (a view, not a copy).
+        # Row 0 is the look-back predecessor and never part of the window.
+        first = max(1, int(np.searchsorted(payems_dates, np.datetime64(start_date), side="left")))
+
+        unemployment = self._load_indicator_series("UNRATE", start_date, end_date)
+
+        payload = ChartPayload(
+            payems_dates=payems_dates[first:],
+            payems_change_10k=payems_change[first:],
+            unrate_dates=unemployment["date"].to_numpy(),
+            unrate_value=unemployment["value"].to_numpy(dtype=float),
             start_date=start_date,
             end_date=end_date,
         )
+        if cache_path:
+            self._write_cache(cache_path, payload)
+        return payload
+
+    def _cache_path(self, end_date: datetime) -> Optional[str]:
+        """
+        Cache file for a payload, keyed on the window end and on the stored state of every
+        chart series. Any new observation, a partially synced release, or a value revision
+        from a full refresh changes the key, so stale entries are never read back.
+        """
+
+        if not self.cache_dir:
+            return None
+        fingerprint = hashlib.sha1(repr(self._series_state()).encode("utf-8")).hexdigest()[:16]
+        file_name = f"labor_market_{self.lookback_years}y_{end_date:%Y%m%d}_{fingerprint}.npz"
+        return os.path.join(self.cache_dir, file_name)
+
+    def _series_state(self) -> List[Tuple]:
+        """
+        Return (code, row count, latest date, value total) for each chart series.
+
+        Aggregated in SQL over the (indicator_id, date, value) index, so no rows are loaded.
+        """
+
+        query = text(
+            """
+            SELECT ei.code, COUNT(dp.id), MAX(dp.date), TOTAL(dp.value)
+            FROM economic_indicators AS ei
+            JOIN economic_data_points AS dp ON dp.indicator_id = ei.id
+            WHERE ei.code IN :codes
+            GROUP BY ei.code
+            ORDER BY ei.code
+            """
+        ).bindparams(bindparam("codes", expanding=True))
+        with self.engine.connect() as connection:
+            rows = connection.execute(query, {"codes": list(CHART_SERIES)}).all()
+        return [tuple(row) for row in rows]
+
+    def _write_cache(self, cache_path: str, payload: ChartPayload) -> None:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a unique temp file and rename, so concurrent writers (threads or processes)
+        # never share a temp file and readers never see a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(
+                    handle,
+                    payems_dates=payload.payems_dates,
+                    payems_change_10k=payload.payems_change_10k,
+                    unrate_dates=payload.unrate_dates,
+                    unrate_value=payload.unrate_value,
+                )
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # Entries for the same window with an older fingerprint can never be read again.
+        prefix = os.path.basename(cache_path).rsplit("_", 1)[0]
+        for stale_path in glob.glob(os.path.join(cache_dir, f"{prefix}_*.npz")):
+            if stale_path != cache_path:
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    pass
 
     def _plot(self, payload: ChartPayload) -> plt.Figure:
         """
-        Render the combo chart given prepared datasets.
+        Render the combo chart given prepared datasets on a fresh figure.
+        """
+
+        # Constrained layout solves once at draw time; no tight_layout/autofmt_xdate passes needed.
+        fig, ax_left = plt.subplots(figsize=(12, 6), layout="constrained")
+        ax_right = ax_left.twinx()
+        self.render_into(fig, ax_left, ax_right, payload)
+        return fig
+
+    @classmethod
+    def _shared_canvas(cls) -> Tuple[Figure, Axes, Axes]:
+        """
+        Lazily create the figure reused by build(reuse_figure=True).
+
+        It is built from matplotlib.figure.Figure rather than pyplot, so it is never
+        registered with (or kept alive by) pyplot's figure manager.
+        """
+
+        if cls._shared_figure is None:
+            fig = Figure(figsize=(12, 6), layout="constrained")
+            ax_left = fig.add_subplot()
+            ax_right = ax_left.twinx()
+            cls._shared_figure = (fig, ax_left, ax_right)
+        return cls._shared_figure
+
+    def render_into(self, fig: Figure, ax_left: Axes, ax_right: Axes, payload: ChartPayload) -> None:
+        """
+        Draw the combo chart onto existing axes, clearing whatever was drawn there before.
+
+        ax_right must be the twin (ax_left.twinx()) of ax_left.
         """
 
-        fig, ax_left = plt.subplots(figsize=(12, 6))
+        ax_left.clear()
+        ax_right.clear()
+        # clear() resets the twin's right-hand placement, so restore it.
+        ax_right.yaxis.tick_right()
+        ax_right.yaxis.set_label_position("right")
+        ax_right.xaxis.set_visible(False)
+        ax_right.patch.set_visible(False)
 
         # Bar chart: monthly change in PAYEMS (ten-thousand jobs)
         ax_left.bar(
-            payload.payems_changes["date"],
-            payload.payems_changes["monthly_change_10k"],
+            payload.payems_dates,
+            payload.payems_change_10k,
             color="#1f77b4",
             alpha=0.8,
-            width=20,
+            # The x values are datetime64, so the width must be a timedelta (not a day count).
+            width=np.timedelta64(20, "D"),
             label="新增非农就业（万人）",
         )
         ax_left.axhline(0, color="#666666", linewidth=0.8)
         ax_left.set_ylabel("新增非农就业（万人）")
 
         # Line chart: unemployment rate (secondary axis)
-        ax_right = ax_left.twinx()
         ax_right.plot(
-            payload.unemployment_rate["date"],
-            payload.unemployment_rate["value"],
+            payload.unrate_dates,
+            payload.unrate_value,
             color="#ff7f0e",
             linewidth=2,
             label="失业率(%)",
@@ -156,8 +321,10 @@ class LaborMarketChartBuilder:
         ax_left.set_xlabel("日期")
         ax_left.set_xlim(payload.start_date, payload.end_date)
 
-        # Improve x-axis readability.
-        fig.autofmt_xdate()
+        # Improve x-axis readability with a fixed quarterly ticker.
+        ax_left.xaxis.set_major_locator(mdates.MonthLocator(interval=3))
+        ax_left.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
+        plt.setp(ax_left.get_xticklabels(), rotation=30, ha="right")
 
         # Build a combined legend.
         handles_left, labels_left = ax_left.get_legend_handles_labels()
@@ -171,34 +338,84 @@ class LaborMarketChartBuilder:
             frameon=False,
         )
 
-        fig.tight_layout()
-        return fig
-
-    def _load_indicator_series(self, fred_code: str) -> pd.DataFrame:
+    def _load_indicator_series(
+        self,
+        fred_code: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> pd.DataFrame:
         """
-        Load every data point for the specified FRED series.
+        Load data points for the specified FRED series, optionally bounded to [start_date, end_date].
+
+        The bounds are applied in SQL so only the requested window leaves SQLite. An empty
+        result is an error only for unbounded loads (the series is missing altogether).
         """
 
+        conditions = [
+            "dp.indicator_id = (SELECT id FROM economic_indicators WHERE code = :fred_code)"
+        ]
+        params: Dict[str, object] = {"fred_code": fred_code}
+        date_params = []
+        if start_date is not None:
+            conditions.append("dp.date >= :start_date")
+            params["start_date"] = pd.Timestamp(start_date).to_pydatetime()
+            date_params.append(bindparam("start_date", type_=DateTime()))
+        if end_date is not None:
+            conditions.append("dp.date <= :end_date")
+            params["end_date"] = pd.Timestamp(end_date).to_pydatetime()
+            date_params.append(bindparam("end_date", type_=DateTime()))
+
+        # Resolving indicator_id first lets SQLite range-scan the (indicator_id, date, value)
+        # index and return rows already in date order. DateTime-typed binds render in the
+        # same text format SQLite stores, so the date comparisons hold.
         query = text(
-            """
+            f"""
             SELECT dp.date AS date, dp.value AS value
             FROM economic_data_points AS dp
-            INNER JOIN economic_indicators AS ei ON ei.id = dp.indicator_id
-            WHERE ei.code = :fred_code
+            WHERE {" AND ".join(conditions)}
             ORDER BY dp.date ASC
             """
+        ).bindparams(*date_params)
+        # Stream in chunks so long unbounded loads never hold the full DBAPI row list at once.
+        chunks = list(
+            pd.read_sql_query(
+                query,
+                self.engine,
+                params=params,
+                parse_dates=["date"],
+                chunksize=SERIES_CHUNK_SIZE,
+            )
         )
-        df = pd.read_sql_query(query, self.engine, params={"fred_code": fred_code}, parse_dates=["date"])
-        if df.empty:
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=["date", "value"])
+        if df.empty and start_date is None and end_date is None:
             raise ValueError(f"未能在数据库中找到指标 {fred_code} 的数据。")
         return df
 
-    def _infer_window(self, df: pd.DataFrame, as_of: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    def _latest_date(self, fred_code: str) -> pd.Timestamp:
+        """
+        Return the most recent observation date for a series without loading its rows.
+        """
+
+        query = text(
+            """
+            SELECT MAX(dp.date)
+            FROM economic_data_points AS dp
+            WHERE dp.indicator_id = (SELECT id FROM economic_indicators WHERE code = :fred_code)
+            """
+        )
+        with self.engine.connect() as connection:
+            latest = connection.execute(query, {"fred_code": fred_code}).scalar()
+        if latest is None:
+            raise ValueError(f"未能在数据库中找到指标 {fred_code} 的数据。")
+        return pd.Timestamp(latest)
+
+    def _infer_window(
+        self, latest_date: pd.Timestamp, as_of: Optional[datetime] = None
+    ) -> Tuple[datetime, datetime]:
         """
-        Given a DataFrame sorted by date, compute the desired lookback window.
+        Given the latest available date, compute the desired lookback window.
         """
 
-        latest_date = df["date"].max()
         end_candidate = latest_date
         if as_of:
             # Ensure the requested month does not exceed available data.
@@ -214,7 +431,7 @@ if __name__ == "__main__":
     figure, payload = builder.build()
     print(
         f"Chart covers {payload.start_date.date()} ~ {payload.end_date.date()} "
-        f"({len(payload.payems_changes)} payroll observations, "
-        f"{len(payload.unemployment_rate)} unemployment observations)."
+        f"({len(payload.payems_dates)} payroll observations, "
+        f"{len(payload.unrate_dates)} unemployment observations)."
     )
     plt.show()
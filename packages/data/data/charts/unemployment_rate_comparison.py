@@ -3,20 +3,25 @@ Chart generator for U-1~U-6 unemployment rates (current vs previous month).
 
 Outputs a grouped bar chart comparing last month vs this month, and provides
 structured data for UI consumption.
+
+Run from packages/data as ``python -m data.charts.unemployment_rate_comparison``.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import pandas as pd
-from matplotlib import font_manager as fm
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from database.connection import get_engine
+
+from .fonts import configure_cjk_fonts
+
 
 DEFAULT_DB_URL = "sqlite:///./fomc_data.db"
 
@@ -56,27 +61,8 @@ class UnemploymentRateComparisonBuilder:
 
     def __init__(self, database_url: str = DEFAULT_DB_URL):
         self.database_url = database_url
-        self._configure_fonts()
-        connect_args: Dict[str, bool] = {}
-        if database_url.startswith("sqlite:///"):
-            connect_args["check_same_thread"] = False
-        self.engine: Engine = create_engine(database_url, connect_args=connect_args, echo=False)
-
-    def _configure_fonts(self) -> None:
-        preferred_fonts = [
-            "SimHei",
-            "Microsoft YaHei",
-            "Noto Sans CJK SC",
-            "WenQuanYi Micro Hei",
-            "Source Han Sans SC",
-        ]
-        available_fonts = {font.name for font in fm.fontManager.ttflist}
-        for font_name in preferred_fonts:
-            if font_name in available_fonts:
-                plt.rcParams["font.sans-serif"] = [font_name] + plt.rcParams.get("font.sans-serif", [])
-                plt.rcParams["axes.unicode_minus"] = False
-                return
-        plt.rcParams["axes.unicode_minus"] = False
+        configure_cjk_fonts()
+        self.engine: Engine = get_engine(database_url)
 
     def build(
         self, as_of: Optional[datetime] = None
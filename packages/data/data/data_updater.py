@@ -54,22 +54,39 @@ class IndicatorDataUpdater:
         Returns:
             Number of newly inserted data points.
         """
-        fetch_ranges = self._determine_fetch_ranges(
-            indicator.id, start_date, end_date, full_refresh
-        )
+        fetch_ranges = self.plan_fetch(indicator, start_date, end_date, full_refresh)
 
         if not fetch_ranges:
             return 0
 
-        removed = self._remove_existing_duplicates(indicator.id)
-        if removed:
-            print(f"Removed {removed} duplicate data points for {indicator.code}")
+        fetched = self.fetch_ranges(indicator.code, fetch_ranges)
+        return self.store_fetched(indicator, fetched, full_refresh=full_refresh)
 
-        total_inserted = 0
+    def plan_fetch(
+        self,
+        indicator: EconomicIndicator,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        full_refresh: bool = False,
+    ) -> List[DateRange]:
+        """
+        Work out which date ranges need fetching. Reads the database but does not modify it.
+        """
+        return self._determine_fetch_ranges(indicator.id, start_date, end_date, full_refresh)
 
+    def fetch_ranges(
+        self, fred_code: str, fetch_ranges: List[DateRange]
+    ) -> List[Tuple[DateRange, pd.DataFrame]]:
+        """
+        Download the given ranges from FRED.
+
+        Only touches the (thread-safe) rate-limited API client, never the session, so it
+        can run on worker threads.
+        """
+        fetched: List[Tuple[DateRange, pd.DataFrame]] = []
         for range_start, range_end in fetch_ranges:
             series_data = self.fred_api.get_series(
-                indicator.code,
+                fred_code,
                 observation_start=range_start.strftime("%Y-%m-%d"),
                 observation_end=range_end.strftime("%Y-%m-%d"),
             )
@@ -84,7 +101,36 @@ class IndicatorDataUpdater:
                 (df["date"] >= pd.Timestamp(range_start))
                 & (df["date"] <= pd.Timestamp(range_end))
             ]
+            fetched.append(((range_start, range_end), df))
+        return fetched
+
+    def store_fetched(
+        self,
+        indicator: EconomicIndicator,
+        fetched: List[Tuple[DateRange, pd.DataFrame]],
+        full_refresh: bool = False,
+    ) -> int:
+        """
+        Write fetched observations for the indicator and commit.
 
+        Returns:
+            Number of newly inserted data points.
+        """
+        if full_refresh:
+            (
+                self.session.query(EconomicDataPoint)
+                .filter(EconomicDataPoint.indicator_id == indicator.id)
+                .delete(synchronize_session=False)
+            )
+            self.session.flush()
+
+        removed = self._remove_existing_duplicates(indicator.id)
+        if removed:
+            print(f"Removed {removed} duplicate data points for {indicator.code}")
+
+        total_inserted = 0
+
+        for (range_start, range_end), df in fetched:
             new_points = self._build_data_points(
                 indicator.id,
                 df,
@@ -167,13 +213,8 @@ class IndicatorDataUpdater:
         if requested_start > requested_end:
             return []
 
-        if full_refresh and (min_date or max_date):
-            (
-                self.session.query(EconomicDataPoint)
-                .filter(EconomicDataPoint.indicator_id == indicator_id)
-                .delete(synchronize_session=False)
-            )
-            self.session.flush()
+        if full_refresh:
+            # Existing points are deleted by store_fetched(); plan as if the series were empty.
             min_date = None
             max_date = None
 
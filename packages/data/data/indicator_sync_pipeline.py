@@ -3,16 +3,106 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set
 
 import pandas as pd
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from data.category_manager import CategoryManager
 from data.data_updater import IndicatorDataUpdater
 from database.models import EconomicIndicator, IndicatorCategory
 
+# Core tables behind the ORM models; the metadata sync writes through these directly.
+INDICATORS = EconomicIndicator.__table__
+CATEGORIES = IndicatorCategory.__table__
+
+# Only these columns of the indicator workbook are used by the sync.
+EXCEL_COLUMNS = ["板块", "经济指标", "Indicator", "FRED 代码"]
+
+# Zero-width characters that sneak into FRED codes copied from the web.
+ZERO_WIDTH_TABLE = str.maketrans("", "", "\u200b\u200c\u200d")
+
+SECTOR_EMPLOYMENT_INDICATORS = frozenset(
+    {
+        "采矿业",
+        "建筑业",
+        "制造业",
+        "批发业",
+        "零售业",
+        "运输仓储业",
+        "公用事业",
+        "信息业",
+        "金融活动",
+        "专业和商业服务",
+        "教育和保健服务",
+        "休闲和酒店业",
+        "其他服务业",
+        "政府",
+    }
+)
+
+CPI_COMPONENT_INDICATORS = frozenset(
+    {
+        "食品",
+        "家庭食品",
+        "在外饮食",
+        "能源",
+        "能源商品",
+        "燃油和其他燃料",
+        "发动机燃料（汽油）",
+        "能源服务",
+        "电力",
+        "公用管道燃气服务",
+        "核心商品（不含食品和能源类）",
+        "家具和其他家用产品",
+        "服饰",
+        "交通工具（不含汽车燃料）",
+        "新车",
+        "二手汽车和卡车",
+        "机动车部件和设备",
+        "医疗用品",
+        "酒精饮料",
+        "核心服务（不含能源）",
+        "住所",
+        "房租",
+        "水、下水道和垃圾回收",
+        "家庭运营",
+        "医疗服务",
+        "运输服务",
+    }
+)
+
+UNEMPLOYMENT_RATE_INDICATORS = frozenset(
+    {
+        "U-1",
+        "U-2",
+        "U-3",
+        "U-4",
+        "U-5",
+        "U-6",
+    }
+)
+
+# Subcategory marker rows in the Excel and the indicators that belong under each.
+SUBCATEGORY_MEMBERS: Dict[str, FrozenSet[str]] = {
+    "分部门新增就业": SECTOR_EMPLOYMENT_INDICATORS,
+    "分项 CPI": CPI_COMPONENT_INDICATORS,
+    "季调各类型失业率": UNEMPLOYMENT_RATE_INDICATORS,
+}
+
+
+class CategoryRow(NamedTuple):
+    """Lightweight stand-in for an IndicatorCategory row."""
+
+    id: int
+    name: str
+    level: int
+    parent_id: Optional[int]
+
 
 class IndicatorSyncPipeline:
     """
@@ -31,12 +121,14 @@ class IndicatorSyncPipeline:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         full_refresh: bool = False,
+        fetch_workers: int = 5,
     ):
         self.session = session
         self.excel_path = excel_path
         self.start_date = start_date
         self.end_date = end_date
         self.full_refresh = full_refresh
+        self.fetch_workers = fetch_workers
         self.data_updater = IndicatorDataUpdater(
             session,
             requests_per_minute=requests_per_minute,
@@ -44,7 +136,9 @@ class IndicatorSyncPipeline:
         )
         self.fred_api = self.data_updater.fred_api
         self.category_manager = CategoryManager(session)
-        self.current_subcategories: Dict[str, IndicatorCategory] = {}
+        self.current_subcategories: Dict[str, CategoryRow] = {}
+        self.indicator_codes: Set[str] = set()
+        self.categories_by_name: Dict[str, CategoryRow] = {}
 
     def run(self):
         """Execute metadata + data sync."""
@@ -54,13 +148,29 @@ class IndicatorSyncPipeline:
 
         self.category_manager.ensure_hierarchy()
 
-        try:
-            for index, row in df.iterrows():
-                board_name = row["板块"]
-                indicator_name = row["经济指标"]
-                english_name = row["Indicator"]
-                fred_code = self._clean_code(row["FRED 代码"])
+        # One query per table up front; rows created during the run are added as we go.
+        # Plain Core rows: the metadata sync never needs the ORM object graph.
+        self.indicator_codes = set(self.session.execute(select(INDICATORS.c.code)).scalars())
+        self.categories_by_name = {
+            row.name: CategoryRow(row.id, row.name, row.level, row.parent_id)
+            for row in self.session.execute(
+                select(CATEGORIES.c.id, CATEGORIES.c.name, CATEGORIES.c.level, CATEGORIES.c.parent_id)
+            )
+        }
 
+        try:
+            # Phase 1: metadata only, upserted in one statement and committed once.
+            # Keyed by code, so a code repeated further down the sheet keeps its last names.
+            indicator_rows: Dict[str, Dict[str, Any]] = {}
+            rows = zip(
+                df.index.to_numpy(),
+                df["板块"].to_numpy(),
+                df["经济指标"].to_numpy(),
+                df["Indicator"].to_numpy(),
+                df["_clean_code"].to_numpy(),
+                df["_is_dup"].to_numpy(),
+            )
+            for index, board_name, indicator_name, english_name, fred_code, is_dup in rows:
                 print(f"\nProcessing row {index+1}: {board_name} - {indicator_name} ({fred_code})")
 
                 # Category-only rows
@@ -69,7 +179,7 @@ class IndicatorSyncPipeline:
                     continue
 
                 # Skip duplicate codes that follow immediately (Excel often repeats)
-                if self._is_duplicate_code(df, index, fred_code):
+                if is_dup:
                     print(f"Skipping duplicate row for {indicator_name} ({fred_code})")
                     continue
 
@@ -78,30 +188,68 @@ class IndicatorSyncPipeline:
                     board_name, indicator_name, board_category.id
                 )
 
-                indicator = self.session.query(EconomicIndicator).filter_by(code=fred_code).first()
-
-                if not indicator:
-                    indicator = self._create_indicator(
-                        indicator_name, english_name, fred_code, category_id
-                    )
-                else:
-                    self._update_indicator_if_needed(
-                        indicator, indicator_name, english_name, category_id
+                row = indicator_rows.get(fred_code)
+                if row is None:
+                    row = indicator_rows[fred_code] = self._indicator_row(
+                        indicator_name, english_name, fred_code
                     )
+                row.update(name=indicator_name, english_name=english_name, category_id=category_id)
+
+            self._upsert_indicators(list(indicator_rows.values()))
+            self.category_manager.apply_indicator_ordering()
+            self.session.commit()
 
+            # Only the fetch path needs ORM objects; load them back in one query.
+            indicators_by_code = {
+                indicator.code: indicator
+                for indicator in self.session.query(EconomicIndicator).filter(
+                    EconomicIndicator.code.in_(list(indicator_rows))
+                )
+            }
+
+            # Phase 2: data. Plans and writes stay on this thread (the session is not
+            # thread-safe); only the FRED downloads run on the pool, paced by the shared
+            # rate limiter. The updater commits per indicator, so a failed plan or fetch
+            # only skips (and rolls back) that indicator.
+            plans = []
+            for fred_code, row in indicator_rows.items():
+                indicator, indicator_name = indicators_by_code[fred_code], row["name"]
                 try:
-                    inserted = self.data_updater.update_indicator_data(
+                    fetch_ranges = self.data_updater.plan_fetch(
                         indicator,
                         start_date=self.start_date,
                         end_date=self.end_date,
                         full_refresh=self.full_refresh,
                     )
-                    print(f"Stored {inserted} new data points for {indicator_name} ({fred_code})")
                 except Exception as e:
                     print(f"Error fetching data for {fred_code}: {str(e)}")
                     self.session.rollback()
+                    continue
+                if not fetch_ranges:
+                    print(f"Stored 0 new data points for {indicator_name} ({fred_code})")
+                    continue
+                plans.append((indicator, indicator_name, fred_code, fetch_ranges))
+
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+                futures = {
+                    executor.submit(self.data_updater.fetch_ranges, fred_code, fetch_ranges): (
+                        indicator,
+                        indicator_name,
+                        fred_code,
+                    )
+                    for indicator, indicator_name, fred_code, fetch_ranges in plans
+                }
+                for future in as_completed(futures):
+                    indicator, indicator_name, fred_code = futures[future]
+                    try:
+                        inserted = self.data_updater.store_fetched(
+                            indicator, future.result(), full_refresh=self.full_refresh
+                        )
+                        print(f"Stored {inserted} new data points for {indicator_name} ({fred_code})")
+                    except Exception as e:
+                        print(f"Error fetching data for {fred_code}: {str(e)}")
+                        self.session.rollback()
 
-            self.category_manager.apply_indicator_ordering()
             print("\nSuccessfully processed all indicators from Excel file")
         except Exception as e:
             print(f"Error processing Excel file: {str(e)}")
@@ -112,7 +260,13 @@ class IndicatorSyncPipeline:
             print(f"Excel file not found at {self.excel_path}")
             return None
 
-        df = pd.read_excel(self.excel_path, sheet_name="Sheet1")
+        df = pd.read_excel(
+            self.excel_path,
+            sheet_name="Sheet1",
+            engine="openpyxl",
+            usecols=EXCEL_COLUMNS,
+            dtype=str,
+        )
         print(f"Total rows in Excel file: {len(df)}")
 
         df = df.replace("", pd.NA)
@@ -120,156 +274,125 @@ class IndicatorSyncPipeline:
         df["FRED 代码"] = df["FRED 代码"].ffill()
         df = df.dropna(subset=["板块", "经济指标"], how="all")
 
+        # Clean codes once and flag codes repeated on the immediately preceding row.
+        codes = df["FRED 代码"].fillna("").astype(str).str.translate(ZERO_WIDTH_TABLE).str.strip()
+        df["_clean_code"] = codes
+        df["_is_dup"] = codes.eq(codes.shift()) & codes.ne("")
+
         print(f"Total rows after processing: {len(df)}")
         print("First few rows:")
         print(df.head(10))
         return df
 
-    def _clean_code(self, code: object) -> str:
-        fred_code = str(code).strip()
-        return fred_code.replace("\u200b", "").replace("\u200c", "").replace("\u200d", "")
-
-    def _is_duplicate_code(self, df: pd.DataFrame, index: int, fred_code: str) -> bool:
-        if index == 0:
-            return False
-        previous_code = self._clean_code(df.iloc[index - 1]["FRED 代码"])
-        return previous_code == fred_code
-
     def _record_subcategory(self, board_name: str, indicator_name: str):
         """Track current subcategory marker for subsequent indicators."""
-        if indicator_name in ["分部门新增就业", "分项 CPI", "季调各类型失业率"]:
+        if indicator_name in SUBCATEGORY_MEMBERS:
             board_category = self._get_or_create_category(board_name, level=1, parent_id=None)
             subcategory = self._get_or_create_category(
                 indicator_name, level=2, parent_id=board_category.id
             )
             self.current_subcategories[board_name] = subcategory
 
-    def _get_or_create_category(self, name: str, level: int, parent_id: Optional[int]) -> IndicatorCategory:
-        category = self.session.query(IndicatorCategory).filter_by(name=name).first()
-        if category:
-            if category.level != level or category.parent_id != parent_id:
-                category.level = level
-                category.parent_id = parent_id
-                self.session.commit()
+    def _get_or_create_category(self, name: str, level: int, parent_id: Optional[int]) -> CategoryRow:
+        category = self.categories_by_name.get(name)
+        if category and category.level == level and category.parent_id == parent_id:
             return category
 
-        category = IndicatorCategory(name=name, level=level, parent_id=parent_id)
-        self.session.add(category)
-        self.session.commit()
-        print(f"Created category: {name} (level {level})")
+        # INSERT ... ON CONFLICT(name) DO UPDATE covers both a new category and a moved one.
+        stmt = sqlite_insert(CATEGORIES).values(name=name, level=level, parent_id=parent_id)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CATEGORIES.c.name],
+            set_={"level": stmt.excluded.level, "parent_id": stmt.excluded.parent_id},
+        ).returning(CATEGORIES.c.id)
+        category_id = self.session.execute(stmt).scalar_one()
+
+        if category is None:
+            print(f"Created category: {name} (level {level})")
+        category = self.categories_by_name[name] = CategoryRow(category_id, name, level, parent_id)
         return category
 
     def _resolve_category_for_indicator(
         self, board_name: str, indicator_name: str, board_category_id: int
     ) -> int:
-        category_id = board_category_id
-        if board_name in self.current_subcategories:
-            subcategory_name = self.current_subcategories[board_name].name
-            if subcategory_name == "分部门新增就业" and indicator_name in [
-                "采矿业",
-                "建筑业",
-                "制造业",
-                "批发业",
-                "零售业",
-                "运输仓储业",
-                "公用事业",
-                "信息业",
-                "金融活动",
-                "专业和商业服务",
-                "教育和保健服务",
-                "休闲和酒店业",
-                "其他服务业",
-                "政府",
-            ]:
-                category_id = self.current_subcategories[board_name].id
-            elif subcategory_name == "分项 CPI" and indicator_name in [
-                "食品",
-                "家庭食品",
-                "在外饮食",
-                "能源",
-                "能源商品",
-                "燃油和其他燃料",
-                "发动机燃料（汽油）",
-                "能源服务",
-                "电力",
-                "公用管道燃气服务",
-                "核心商品（不含食品和能源类）",
-                "家具和其他家用产品",
-                "服饰",
-                "交通工具（不含汽车燃料）",
-                "新车",
-                "二手汽车和卡车",
-                "机动车部件和设备",
-                "医疗用品",
-                "酒精饮料",
-                "核心服务（不含能源）",
-                "住所",
-                "房租",
-                "水、下水道和垃圾回收",
-                "家庭运营",
-                "医疗服务",
-                "运输服务",
-            ]:
-                category_id = self.current_subcategories[board_name].id
-            elif subcategory_name == "季调各类型失业率" and indicator_name in [
-                "U-1",
-                "U-2",
-                "U-3",
-                "U-4",
-                "U-5",
-                "U-6",
-            ]:
-                category_id = self.current_subcategories[board_name].id
-        return category_id
-
-    def _create_indicator(
-        self, indicator_name: str, english_name: str, fred_code: str, category_id: int
-    ) -> EconomicIndicator:
+        subcategory = self.current_subcategories.get(board_name)
+        if subcategory and indicator_name in SUBCATEGORY_MEMBERS.get(subcategory.name, ()):
+            return subcategory.id
+        return board_category_id
+
+    def _indicator_row(self, indicator_name: str, english_name: str, fred_code: str) -> Dict[str, Any]:
+        """
+        Build the insert values for an indicator row.
+
+        FRED series metadata is only looked up for codes not yet in the database; for
+        existing codes the upsert only rewrites name/english_name/category_id. run() keys
+        rows by code, so each code is looked up at most once per run.
+        """
+        row: Dict[str, Any] = {
+            "code": fred_code,
+            "description": None,
+            "frequency": None,
+            "units": None,
+            "seasonal_adjustment": None,
+            "last_updated": None,
+        }
+        if fred_code in self.indicator_codes:
+            return row
+
         try:
             metadata = self.fred_api.get_series_info(fred_code)
             series_info = metadata.get("seriess", [{}])[0]
-            description = series_info.get("description", "")
-            frequency = series_info.get("frequency", "")
-            units = series_info.get("units", "")
-            seasonal_adjustment = series_info.get("seasonal_adjustment", "")
             last_updated = series_info.get("last_updated", None)
             if last_updated:
                 last_updated = datetime.strptime(last_updated, "%Y-%m-%d %H:%M:%S")
+            row.update(
+                description=series_info.get("description", ""),
+                frequency=series_info.get("frequency", ""),
+                units=series_info.get("units", ""),
+                seasonal_adjustment=series_info.get("seasonal_adjustment", ""),
+                last_updated=last_updated,
+            )
         except Exception as e:
             print(f"Warning: Could not fetch metadata for {fred_code}: {str(e)}")
-            description = english_name if english_name else indicator_name
-            frequency = ""
-            units = ""
-            seasonal_adjustment = ""
-            last_updated = None
-
-        indicator = EconomicIndicator(
-            name=indicator_name,
-            code=fred_code,
-            english_name=english_name,
-            description=description,
-            frequency=frequency,
-            units=units,
-            seasonal_adjustment=seasonal_adjustment,
-            last_updated=last_updated,
-            category_id=category_id,
-        )
+            row.update(
+                description=english_name if english_name else indicator_name,
+                frequency="",
+                units="",
+                seasonal_adjustment="",
+            )
 
-        self.session.add(indicator)
-        self.session.commit()
         print(f"Created indicator: {indicator_name} ({fred_code})")
-        return indicator
+        return row
 
-    def _update_indicator_if_needed(
-        self, indicator: EconomicIndicator, indicator_name: str, english_name: str, category_id: int
-    ):
-        if (
-            indicator.name != indicator_name
-            or indicator.english_name != english_name
-            or indicator.category_id != category_id
-        ):
-            indicator.name = indicator_name
-            indicator.english_name = english_name
-            indicator.category_id = category_id
-            self.session.commit()
-            print(f"Updated indicator: {indicator_name} ({indicator.code})")
+    def _upsert_indicators(self, rows: List[Dict[str, Any]]):
+        """
+        Insert new indicators and sync name/english_name/category_id of existing ones
+        with a single executemany INSERT ... ON CONFLICT(code) DO UPDATE.
+
+        The conflict branch only fires when something changed (IS NOT is SQLite's
+        NULL-safe <>), so rows whose metadata already matches are not rewritten.
+        """
+        if not rows:
+            return
+
+        stmt = sqlite_insert(INDICATORS)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[INDICATORS.c.code],
+            set_={
+                "name": excluded.name,
+                "english_name": excluded.english_name,
+                "category_id": excluded.category_id,
+            },
+            where=or_(
+                INDICATORS.c.name.is_distinct_from(excluded.name),
+                INDICATORS.c.english_name.is_distinct_from(excluded.english_name),
+                INDICATORS.c.category_id.is_distinct_from(excluded.category_id),
+            ),
+        )
+        result = self.session.execute(stmt, rows)
+
+        created = sum(1 for row in rows if row["code"] not in self.indicator_codes)
+        self.indicator_codes.update(row["code"] for row in rows)
+        updated = result.rowcount - created
+        if updated > 0:
+            print(f"Updated metadata for {updated} indicators")
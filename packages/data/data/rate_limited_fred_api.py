@@ -1,6 +1,7 @@
 # Enhanced FRED API with Rate Limiting for FOMC Project
 
 import os
+import threading
 import time
 import requests
 import pandas as pd
@@ -37,29 +38,33 @@ class RateLimitedFredAPI:
         # Rate limiting parameters
         self.requests_per_minute = requests_per_minute
         self.request_times = []  # Track request timestamps
+        self._rate_lock = threading.Lock()  # Guards request_times across fetch threads
         
         # Default date range (configurable start to latest)
         self.default_start_date = default_start_date
     
     def _check_rate_limit(self):
         """
-        Check if we need to wait to respect rate limits
+        Check if we need to wait to respect rate limits (safe to call from several threads)
         """
-        now = time.time()
-        current_minute = now - 60  # 60 seconds ago
-        
-        # Remove old request timestamps (older than 1 minute)
-        self.request_times = [t for t in self.request_times if t > current_minute]
-        
-        # If we've reached the limit, wait until we can make another request
-        if len(self.request_times) >= self.requests_per_minute:
-            sleep_time = 60 - (now - self.request_times[0]) + 1  # Add 1 second buffer
-            if sleep_time > 0:
-                print(f"Rate limit reached. Waiting {sleep_time:.1f} seconds...")
-                time.sleep(sleep_time)
-        
-        # Record this request
-        self.request_times.append(now)
+        with self._rate_lock:
+            now = time.time()
+            current_minute = now - 60  # 60 seconds ago
+
+            # Remove old request timestamps (older than 1 minute)
+            self.request_times = [t for t in self.request_times if t > current_minute]
+
+            # If we've reached the limit, wait until we can make another request.
+            # Sleeping while holding the lock makes other threads queue behind us.
+            if len(self.request_times) >= self.requests_per_minute:
+                sleep_time = 60 - (now - self.request_times[0]) + 1  # Add 1 second buffer
+                if sleep_time > 0:
+                    print(f"Rate limit reached. Waiting {sleep_time:.1f} seconds...")
+                    time.sleep(sleep_time)
+                    now = time.time()
+
+            # Record this request
+            self.request_times.append(now)
     
     def get_series(self, series_id: str, 
                    observation_start: Optional[str] = None,
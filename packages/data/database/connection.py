@@ -2,7 +2,10 @@
 
 import os
 import sys
-from sqlalchemy import create_engine
+from typing import Dict
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker
 from .base import Base
 
@@ -10,10 +13,78 @@ from .base import Base
 # The database file will be created in the project root directory
 DATABASE_URL = "sqlite:///./fomc_data.db"
 
+# Per-connection PRAGMAs applied to every new SQLite connection; the larger page cache
+# (~64MB) keeps hot indexes in memory. WAL is persistent and set once by enable_wal().
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+_engines: Dict[str, Engine] = {}
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def get_engine(database_url: str = DATABASE_URL) -> Engine:
+    """
+    Return the process-wide engine for database_url, creating it on first use
+    """
+    engine = _engines.get(database_url)
+    if engine is not None:
+        return engine
+
+    if database_url.startswith("sqlite:///"):
+        # SQLite needs check_same_thread=False when the pooled connections are shared across threads
+        engine = create_engine(
+            database_url,
+            echo=False,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=5,
+            pool_pre_ping=True,
+        )
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    else:
+        engine = create_engine(database_url, echo=False, pool_pre_ping=True)
+
+    _engines[database_url] = engine
+    return engine
+
+
+def enable_wal(bind: Engine):
+    """
+    Switch a SQLite database to WAL so readers (web app, charts) run alongside the sync writer.
+    The journal mode is stored in the database file, so only the writer scripts call this.
+    """
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.connect() as connection:
+        connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+
+def ensure_indexes(bind: Engine):
+    """
+    Create any model-declared indexes missing from existing tables.
+    create_all() only adds indexes when it creates the table itself.
+    """
+    from . import models  # noqa: F401  (registers the tables on Base.metadata)
+
+    existing_tables = set(inspect(bind).get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
 # Create engine and session
-# For SQLite, we need to set check_same_thread to False for use with FastAPI
 try:
-    engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+    engine = get_engine(DATABASE_URL)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 except Exception as e:
     print(f"Error creating database engine: {e}")
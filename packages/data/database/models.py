@@ -1,6 +1,6 @@
 # Database models for FOMC project
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -62,6 +62,8 @@ class EconomicDataPoint(Base):
     __tablename__ = 'economic_data_points'
     __table_args__ = (
         UniqueConstraint('indicator_id', 'date', name='uq_indicator_date'),
+        # Covering index: series reads (indicator_id =, date range, ordered by date) are served from the index alone
+        Index('idx_data_points_indicator_date_value', 'indicator_id', 'date', 'value'),
     )
     
     id = Column(Integer, primary_key=True)
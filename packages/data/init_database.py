@@ -7,7 +7,8 @@ import os
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database.connection import Base, engine
+from database import models  # noqa: F401  (registers tables on Base.metadata)
+from database.connection import Base, enable_wal, engine, ensure_indexes
 
 def main():
     """Initialize the database tables"""
@@ -16,6 +17,8 @@ def main():
     try:
         # Create tables directly using Base metadata
         Base.metadata.create_all(bind=engine)
+        enable_wal(engine)
+        ensure_indexes(engine)
         print("Database initialized successfully!")
         return 0
     except Exception as e:
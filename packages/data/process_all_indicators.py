@@ -2,12 +2,19 @@ import argparse
 import os
 import sys
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.indicator_sync_pipeline import IndicatorSyncPipeline
+from database.connection import enable_wal, ensure_indexes, get_engine
+
+
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 
 def parse_arguments():
@@ -15,6 +22,12 @@ def parse_arguments():
     parser.add_argument("--start-date", help="Fetch data starting from this date (YYYY-MM-DD).")
     parser.add_argument("--end-date", help="Fetch data up to this date (YYYY-MM-DD).")
     parser.add_argument("--requests-per-minute", type=int, default=30, help="FRED API request limit per minute.")
+    parser.add_argument(
+        "--fetch-workers",
+        type=positive_int,
+        default=5,
+        help="Number of concurrent FRED downloads (still bounded by --requests-per-minute).",
+    )
     parser.add_argument(
         "--default-start-date",
         default="2010-01-01",
@@ -32,7 +45,9 @@ def process_all_indicators(args):
     """
     Process all indicators from Excel file and fetch their data
     """
-    engine = create_engine("sqlite:///fomc_data.db")
+    engine = get_engine("sqlite:///fomc_data.db")
+    enable_wal(engine)
+    ensure_indexes(engine)
     Session = sessionmaker(bind=engine)
     session = Session()
 
@@ -50,6 +65,7 @@ def process_all_indicators(args):
         start_date=args.start_date,
         end_date=args.end_date,
         full_refresh=args.full_refresh,
+        fetch_workers=args.fetch_workers,
     )
     pipeline.run()
     session.close()
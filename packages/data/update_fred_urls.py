@@ -5,18 +5,19 @@
 
 import os
 import sys
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
 
 # 将项目根目录添加到Python路径中
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from database.connection import get_engine
+
 # 使用项目根目录的数据库文件
 DATABASE_URL = "sqlite:///" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "fomc_data.db")
 
 def update_database():
     """更新数据库结构"""
-    engine = create_engine(DATABASE_URL)
+    engine = get_engine(DATABASE_URL)
     
     # 检查fred_url列是否已存在
     with engine.connect() as connection:
@@ -31,33 +32,21 @@ def update_database():
         else:
             print("fred_url列已存在")
     
-    # 更新所有指标的fred_url
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    
-    try:
-        # 获取所有指标
-        indicators = session.execute(text("SELECT id, code FROM economic_indicators")).fetchall()
-        
-        for indicator in indicators:
-            indicator_id, code = indicator
-            # 生成FRED URL
-            fred_url = f"https://fred.stlouisfed.org/series/{code}"
-            
-            # 更新数据库
-            session.execute(
-                text("UPDATE economic_indicators SET fred_url = :url WHERE id = :id"),
-                {"url": fred_url, "id": indicator_id}
+    # 更新所有指标的fred_url：单条UPDATE语句完成，只改动缺失或过期的链接
+    with engine.connect() as connection:
+        try:
+            result = connection.execute(
+                text(
+                    "UPDATE economic_indicators "
+                    "SET fred_url = 'https://fred.stlouisfed.org/series/' || code "
+                    "WHERE fred_url IS NULL OR fred_url <> 'https://fred.stlouisfed.org/series/' || code"
+                )
             )
-        
-        session.commit()
-        print(f"已更新 {len(indicators)} 个指标的FRED URL")
-        
-    except Exception as e:
-        session.rollback()
-        print(f"更新失败: {e}")
-    finally:
-        session.close()
+            connection.commit()
+            print(f"已更新 {result.rowcount} 个指标的FRED URL")
+        except Exception as e:
+            connection.rollback()
+            print(f"更新失败: {e}")
 
 if __name__ == "__main__":
     update_database()
\ No newline at end of file
@@ -30,8 +30,8 @@ load_dotenv(REPO_ROOT / ".env")
 # 统一使用仓库根目录的数据库文件，便于各模块共享
 DATABASE_URL = f"sqlite:///{REPO_ROOT / 'fomc_data.db'}"
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from database.connection import get_engine
 from database.models import EconomicIndicator, EconomicDataPoint, IndicatorCategory
 from sqlalchemy import func
 
@@ -42,7 +42,7 @@ from data.charts.cpi_report import CpiReportBuilder
 from reports.report_generator import EconomicReportGenerator, IndicatorSummary, ReportFocus
 
 # 创建引擎和会话
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+engine = get_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 app = Flask(__name__, template_folder='templates')
@@ -50,7 +50,10 @@ app = Flask(__name__, template_folder='templates')
 def get_labor_chart_builder():
     """Singleton accessor so we reuse the same chart builder."""
     if not hasattr(app, "_labor_chart_builder"):
-        app._labor_chart_builder = LaborMarketChartBuilder(database_url=DATABASE_URL)
+        app._labor_chart_builder = LaborMarketChartBuilder(
+            database_url=DATABASE_URL,
+            cache_dir=str(PACKAGE_ROOT / "cache" / "charts"),
+        )
     return app._labor_chart_builder
 
 
@@ -766,10 +769,8 @@ def generate_labor_market_report():
     participation_mom = None
 
     start_window = parsed_month - pd.DateOffset(years=2)
-    employment_df = chart_builder._load_indicator_series("EMRATIO")
-    participation_df = chart_builder._load_indicator_series("CIVPART")
-    employment_df = employment_df[(employment_df["date"] >= start_window) & (employment_df["date"] <= parsed_month)].copy()
-    participation_df = participation_df[(participation_df["date"] >= start_window) & (participation_df["date"] <= parsed_month)].copy()
+    employment_df = chart_builder._load_indicator_series("EMRATIO", start_window, parsed_month)
+    participation_df = chart_builder._load_indicator_series("CIVPART", start_window, parsed_month)
 
     merged = pd.merge(
         employment_df.rename(columns={"value": "employment_rate"}),